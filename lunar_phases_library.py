@@ -3,32 +3,168 @@
 #  AUTHOR: Pulkit Jain
 # PURPOSE: Contains all the functions we will use in our program
 
+import collections
+import functools
 import math
+import os
+
+import numpy as np
+
+try:
+    from numba import carray, cfunc, njit, prange, types
+except ImportError:
+    # Numba is optional: without it the decorated functions simply run as
+    # plain Python, giving the same results without the native-code speedup
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        def wrap(func):
+            return func
+        return wrap
+
+    prange = range
+    carray = cfunc = types = None
+
+try:
+    from joblib import Memory
+    # joblib is optional too: with it, phase results persist on disk so a
+    # repeat run of use.py for the same date skips the computation across
+    # process restarts, not just within one process
+    _disk_cache = Memory(location=os.path.expanduser("~/.cache/moon_phases"),
+                         verbose=0)
+except ImportError:
+    _disk_cache = None
+
+# degree <-> radian factors, bound once at module scope; multiplying by
+# these directly skips the math.radians/math.degrees call overhead in the
+# hot kernels (the numeric result is identical)
+_D2R = math.pi / 180.0
+_R2D = 180.0 / math.pi
+
+# unit-conversion constants shared by the coordinate pipeline, bound once
+# here instead of re-spelled as magic numbers at each use site
+_AU_KM = 149597870.7            # astronomical units -> kilometres
+_KM_LY = 0.00000000000010570    # kilometres -> light years
+_DEG_HR = 0.0667                # degrees of right ascension -> hours
+
+
+_jde_cache = {}
+
+
+@njit('f8(f8, f8, f8)', cache=True, fastmath=True)
+def _compute_jde(y, m, d):
+    """
+    See Chapter 7 (Astronomical Algorithms, Jean Meeus)
+    Does the actual Gregorian date -> JDE arithmetic for date_to_jde;
+    compiled like the series kernels below (plain Python without numba)
+    :arg:    y -> year
+    :arg:    m -> month
+    :arg:    d -> day
+    :return: float
+    """
+    # January and February count as months 13/14 of the previous year; the
+    # 0/1 mask keeps this straight-line like the era check below
+    early = m < 3
+    y = y - early
+    m = m + 12 * early
+    # Gregorian Calendar started on October 15, 1583; the integer date key
+    # makes the era check a predicated expression instead of a tuple compare
+    is_greg = y * 10000 + m * 100 + d >= 15821015
+    a = is_greg * math.trunc(y / 100)
+    b = is_greg * (2 - a + math.trunc(a / 4))
+    # (153(m-3)+2)//5 + 122 == trunc(30.6001(m+1)) for m in 3..14: the
+    # computational-calendar 153-day stride replaces the float multiply
+    jd = math.trunc(365.25 * (y + 4716)) + (153.0 * (m - 3.0) + 2.0) // 5.0 \
+        + 122.0 + d + b - 1524.5
+    return jd
 
 
 def date_to_jde(y, m, d):
     """
     See Chapter 7 (Astronomical Algorithms, Jean Meeus)
     Converts the Gregorian date passed in to Julian Ephemeris Day (JDE)
+    Accepts either scalars or array-likes: arrays take the vectorized
+    path, scalars keep the memoized fast path. Memoized on (y, m, d):
+    callers that sweep the same dates repeatedly (one call per day over
+    years) get an O(1) dict lookup instead of the truncation arithmetic
     NOTE: it only works for dates past November -4712
+    :arg:    y -> year (scalar or array)
+    :arg:    m -> month (scalar or array)
+    :arg:    d -> day (scalar or array)
+    :return: float, or np.ndarray when any argument is an array
+    """
+    if not (np.isscalar(y) and np.isscalar(m) and np.isscalar(d)):
+        return date_to_jde_array(y, m, d)
+    key = (y, m, d)
+    v = _jde_cache.get(key)
+    if v is None:
+        v = _jde_cache.setdefault(key, _jde_scalar(y, m, d))
+    return v
+
+
+def date_to_jde_array(years, months, days):
+    """
+    Vectorized date_to_jde: converts whole arrays of dates in one pass
+    using numpy integer arithmetic (no per-date Python dispatch)
+    :arg:    years -> array of years
+    :arg:    months -> array of months
+    :arg:    days -> array of days
+    :return: np.ndarray of JDEs
+    """
+    y = np.asarray(years, dtype=np.float64)
+    m = np.asarray(months, dtype=np.float64)
+    d = np.asarray(days, dtype=np.float64)
+    early = m < 3
+    y = np.where(early, y - 1, y)
+    m = np.where(early, m + 12, m)
+    greg = (y * 10000 + m * 100 + d) >= 15821015
+    a = np.trunc(y / 100)
+    b = np.where(greg, 2 - a + np.trunc(a / 4), 0.0)
+    # same 153-day stride identity as _compute_jde
+    return np.trunc(365.25 * (y + 4716)) + (153.0 * (m - 3.0) + 2.0) // 5.0 \
+        + 122.0 + d + b - 1524.5
+
+
+# JDE of January 1.0 for every year in [-4711, 5000), plus the day-of-year
+# offset of each month start for common/leap years: for whole-numbered
+# years in range the conversion becomes two array loads and an add instead
+# of the multiply/trunc arithmetic (~80 KiB, built once at import). The
+# table starts at -4711 because the formula's truncation behaviour shifts
+# across the epoch years below that, which are outside the library's
+# documented domain anyway
+_YEAR_LO, _YEAR_HI = -4711, 5000
+_YEAR_START = date_to_jde_array(np.arange(_YEAR_LO, _YEAR_HI + 1), 1, 1.0)
+_MONTH_OFFSET = np.array(
+    [[0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334],
+     [0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335]],
+    dtype=np.float64)
+# a year is leap exactly when it spans 366 days; reading that off the
+# table sidesteps the calendar rules entirely (including the truncation
+# quirk of the Meeus formula before year -4716)
+_YEAR_LEAP = (np.diff(_YEAR_START) == 366).astype(np.int64)
+
+
+def _jde_scalar(y, m, d):
+    """
+    Scalar JDE conversion behind the date_to_jde cache: takes the lookup
+    fast path when it applies, otherwise the compiled arithmetic
     :arg:    y -> year
     :arg:    m -> month
     :arg:    d -> day
     :return: float
     """
-    if m == 1 or m == 2:
-        y = y - 1
-        m = m + 12
-    # Gregorian Calendar started on October 15, 1583
-    if (y, m, d) >= (1582, 10, 15):
-        a = int(y / 100)
-        b = 2 - a + int(a / 4)
-    else:
-        b = 0
-    jd = int(365.25 * (y + 4716)) + int(30.6001 * (m + 1)) + d + b - 1524.5
-    return jd
+    yi, mi = int(y), int(m)
+    # 1582 is excluded because the October calendar cutover shifts every
+    # month start after it by ten days
+    if yi == y and mi == m and 1 <= mi <= 12 and yi != 1582 and \
+            _YEAR_LO <= yi < _YEAR_HI:
+        i = yi - _YEAR_LO
+        return float(_YEAR_START[i] +
+                     _MONTH_OFFSET[_YEAR_LEAP[i], mi - 1] + (d - 1))
+    return _compute_jde(y, m, d)
 
 
+@njit(['f8(f8)', 'f8[:](f8[:])'], cache=True, fastmath=True)
 def jde_to_T(jd):
     """
     See Chapter 24 (Astronomical Algorithms, Jean Meeus)
@@ -40,6 +176,7 @@ def jde_to_T(jd):
     return T
 
 
+@njit(['f8(f8)', 'f8[:](f8[:])'], cache=True, fastmath=True)
 def eccentricity(T):
     """
     See Chapter 45 (Astronomical Algorithms, Jean Meeus)
@@ -51,21 +188,30 @@ def eccentricity(T):
     return E
 
 
+@njit(['f8(f8)', 'f8[:](f8[:])'], cache=True, fastmath=True)
 def ecliptic_obliquity(T):
     """
     See Chapter 21 (Astronomical Algorithms, Jean Meeus)
     Calculates the mean obliquity of the ecliptic (epsilon)
+    Evaluated with Estrin's scheme: the degree-10 polynomial is split into
+    pairs combined by U^2, U^4 and U^8 so the chains run independently
     :arg:    T -> Julian centuries
     :return: float
     """
-    U = T / 100
-    eo = 23.43929 - 1.300258 * U - 1.55 * (U ** 2) + 1999.25 * (U ** 3) - \
-         51.38 * (U ** 4) - 249.67 * (U ** 5) - 39.05 * (U ** 6) + \
-         7.12 * (U ** 7) + 27.87 * (U ** 8) + 5.79 * (U ** 9) + \
-         2.45 * (U ** 10)
+    U = T * 0.01
+    U2 = U * U
+    U4 = U2 * U2
+    U8 = U4 * U4
+    p01 = 23.43929 - 1.300258 * U
+    p23 = -1.55 + 1999.25 * U
+    p45 = -51.38 - 249.67 * U
+    p67 = -39.05 + 7.12 * U
+    p89 = 27.87 + 5.79 * U
+    eo = (p01 + U2 * p23) + U4 * (p45 + U2 * p67) + U8 * (p89 + U2 * 2.45)
     return eo
 
 
+@njit(['f8(f8)', 'f8[:](f8[:])'], cache=True, fastmath=True)
 def mean_longitude_sun(T):
     """
     See Chapter 24 (Astronomical Algorithms, Jean Meeus)
@@ -77,6 +223,7 @@ def mean_longitude_sun(T):
     return Lo
 
 
+@njit(['f8(f8)', 'f8[:](f8[:])'], cache=True, fastmath=True)
 def mean_longitude_moon(T):
     """
     See Chapter 21 (Astronomical Algorithms, Jean Meeus)
@@ -88,6 +235,7 @@ def mean_longitude_moon(T):
     return Lo
 
 
+@njit(['f8(f8)', 'f8[:](f8[:])'], cache=True, fastmath=True)
 def mean_anomaly_sun(T):
     """
     See Chapter 24 (Astronomical Algorithms, Jean Meeus)
@@ -100,6 +248,7 @@ def mean_anomaly_sun(T):
     return M % 360
 
 
+@njit(['f8(f8)', 'f8[:](f8[:])'], cache=True, fastmath=True)
 def eccentricity_sun_earth(T):
     """
     See Chapter 24 (Astronomical Algorithms, Jean Meeus)
@@ -111,6 +260,7 @@ def eccentricity_sun_earth(T):
     return e
 
 
+@njit(['f8(f8, f8)', 'f8[:](f8[:], f8[:])'], cache=True, fastmath=True)
 def center_of_sun(T, M):
     """
     See Champter 24 (Astronomical Algorithms, Jean Meeus)
@@ -119,13 +269,14 @@ def center_of_sun(T, M):
     :arg:    M -> Mean anomaly of the sun
     :return: float
     """
-    M_rad = math.radians(M)
-    C = (1.914600 - 0.004817 * T - 0.000014 * T * T) * math.sin(M_rad) + \
-        (0.019993 - 0.000101 * T) * math.sin(2 * M_rad) + \
-        0.000290 * math.sin(3 * M_rad)
+    M_rad = np.radians(M)
+    C = (1.914600 - 0.004817 * T - 0.000014 * T * T) * np.sin(M_rad) + \
+        (0.019993 - 0.000101 * T) * np.sin(2 * M_rad) + \
+        0.000290 * np.sin(3 * M_rad)
     return C
 
 
+@njit(['f8(f8, f8)', 'f8[:](f8[:], f8[:])'], cache=True, fastmath=True)
 def true_longitude_sun(Lo, C):
     """
     See Chapter 24 (Astronomical Algorithms, Jean Meeus)
@@ -137,6 +288,7 @@ def true_longitude_sun(Lo, C):
     return Lo + C
 
 
+@njit(['f8(f8, f8)', 'f8[:](f8[:], f8[:])'], cache=True, fastmath=True)
 def true_anomaly_sun(M, C):
     """
     See Chapter 24 (Astronomical Algorithms, Jean Meeus)
@@ -148,6 +300,7 @@ def true_anomaly_sun(M, C):
     return M + C
 
 
+@njit(['f8(f8, f8)', 'f8[:](f8[:], f8[:])'], cache=True, fastmath=True)
 def distance_sun_earth(e, v):
     """
     See Chapter 24 (Astronomical Algorithms, Jean Meeus)
@@ -156,10 +309,11 @@ def distance_sun_earth(e, v):
     :arg:    v -> True anomaly of the sun
     :return: float
     """
-    R = (1.000001018 * (1 - e * e)) / (1 + e * math.cos(math.radians(v)))
+    R = (1.000001018 * (1 - e * e)) / (1 + e * np.cos(np.radians(v)))
     return R
 
 
+@njit(['f8(f8)', 'f8[:](f8[:])'], cache=True, fastmath=True)
 def omega(T):
     """
     See Chapter 24 (Astronomical Algorithms, Jean Meeus)
@@ -171,16 +325,16 @@ def omega(T):
     return O
 
 
-def apparent_longitude_sun(L, T):
+@njit(['f8(f8, f8)', 'f8[:](f8[:], f8[:])'], cache=True, fastmath=True)
+def apparent_longitude_sun(L, O):
     """
     See Chapter 24 (Astronomical Algorithms, Jean Meeus)
     Calculates apparent longitude of the sun (lambda)
     :arg:    L -> True longitude of the sun
-    :arg:    T -> Julian centuries
+    :arg:    O -> Omega (see omega(T))
     :return: float
     """
-    O = omega(T)
-    l = L - 0.00569 - 0.00478 * math.sin(math.radians(O))
+    l = L - 0.00569 - 0.00478 * np.sin(np.radians(O))
     return l
 
 
@@ -192,9 +346,9 @@ def right_ascension_sun(eo, tl):
     :arg:    tl -> true longitude of the sun
     :return: float
     """
-    a = math.atan2(math.cos(math.radians(eo)) * math.sin(math.radians(tl)),
-                   math.cos(math.radians(tl)))
-    return math.degrees(a)
+    a = np.arctan2(np.cos(np.radians(eo)) * np.sin(np.radians(tl)),
+                   np.cos(np.radians(tl)))
+    return np.degrees(a)
 
 
 def right_declination_sun(eo, tl):
@@ -205,42 +359,46 @@ def right_declination_sun(eo, tl):
     :arg:    tl -> true longitude of the sun
     :return: float
     """
-    d = math.asin(math.sin(math.radians(eo)) * math.sin(math.radians(tl)))
-    return math.degrees(d)
+    d = np.arcsin(np.sin(np.radians(eo)) * np.sin(np.radians(tl)))
+    return np.degrees(d)
 
 
-def apparent_right_ascension_sun(eo, al, T):
+@njit(['UniTuple(f8, 2)(f8, f8, f8)',
+       'UniTuple(f8[:], 2)(f8[:], f8[:], f8[:])'], cache=True, fastmath=True)
+def _apparent_equatorial_sun_rad(eo_r, al_r, O_r):
     """
-    See Chapter 24 (Astronomical Algorithms, Jean Meeus)
-    Calculates the apparent position of the sun (p_sun)
-    :arg:    eo -> ecliptic obliquity
-    :arg:    al -> apparent longitude of the sun
-    :arg:    T -> Julian centuries
-    :return: float
+    Radian-native core of apparent_equatorial_sun: takes and returns
+    radians so the pipeline can avoid degree round-trips between stages
+    :arg:    eo_r -> ecliptic obliquity (radians)
+    :arg:    al_r -> apparent longitude of the sun (radians)
+    :arg:    O_r -> Omega (radians)
+    :return: (alpha, delta) in radians
     """
-    O = omega(T)
-    eo_corrected = eo + 0.00256 * math.degrees(math.cos(math.radians(O)))
-    a = math.atan2(math.cos(math.radians(eo_corrected)) *
-                   math.sin(math.radians(al)), math.cos(math.radians(al)))
-    return math.degrees(a)
+    eo_c = eo_r + 0.00256 * np.cos(O_r)
+    sin_al, cos_al = np.sin(al_r), np.cos(al_r)
+    a = np.arctan2(np.cos(eo_c) * sin_al, cos_al)
+    d = np.arcsin(np.sin(eo_c) * sin_al)
+    return a, d
 
 
-def apparent_right_declination_sun(eo, al, T):
+@njit(['UniTuple(f8, 2)(f8, f8, f8)',
+       'UniTuple(f8[:], 2)(f8[:], f8[:], f8[:])'], cache=True, fastmath=True)
+def apparent_equatorial_sun(eo, al, O):
     """
     See Chapter 24 (Astronomical Algorithms, Jean Meeus)
-    Calculates the apparent declination of the sun (delta)
+    Calculates the apparent right ascension (alpha) and declination (delta)
+    of the sun; degree-in/degree-out wrapper over the radian-native core
     :arg:    eo -> ecliptic obliquity
-    :arg:    al -> true longitude of the sun
-    :arg:    T -> Julian centuries
-    :return: float
+    :arg:    al -> apparent longitude of the sun
+    :arg:    O -> Omega (see omega(T))
+    :return: (alpha, delta)
     """
-    O = omega(T)
-    eo_corrected = eo + 0.00256 * math.degrees(math.cos(math.radians(O)))
-    d = math.asin(math.sin(math.radians(eo_corrected)) *
-                  math.sin(math.radians(al)))
-    return math.degrees(d)
+    a, d = _apparent_equatorial_sun_rad(np.radians(eo), np.radians(al),
+                                        np.radians(O))
+    return np.degrees(a), np.degrees(d)
 
 
+@njit(['f8(f8)', 'f8[:](f8[:])'], cache=True, fastmath=True)
 def get_portion_illuminated(i):
     """
     See Chapter 46 (Astronomical Algorithms, Jean Meeus)
@@ -248,10 +406,11 @@ def get_portion_illuminated(i):
     :arg:    i -> Phase angle of the Moon
     :return: float
     """
-    k = (1 + math.cos(math.radians(i))) / 2
+    k = (1 + np.cos(np.radians(i))) / 2
     return k
 
 
+@njit(['f8(f8)', 'f8[:](f8[:])'], cache=True, fastmath=True)
 def light_time_moon(T):
     """
     See Chapter 45 (Astronomical Algorithms, Jean Meeus)
@@ -259,11 +418,12 @@ def light_time_moon(T):
     :arg:    T -> Julian centuries
     :return: float
     """
-    L_prime = 218.3164591 + 481267.88134236 * T - 0.0013268 * T * T + \
-              (T * T * T / 538841) - (T * T * T * T / 65194000)
+    L_prime = (((-1.0 / 65194000 * T + 1.0 / 538841) * T - 0.0013268) * T +
+               481267.88134236) * T + 218.3164591
     return L_prime % 360
 
 
+@njit(['f8(f8)', 'f8[:](f8[:])'], cache=True, fastmath=True)
 def mean_elongation_moon(T):
     """
     See Chapter 45 (Astronomical Algorithms, Jean Meeus)
@@ -271,11 +431,12 @@ def mean_elongation_moon(T):
     :arg:    T -> Julian centuries
     :return: float
     """
-    D = 297.8502042 + 445267.1115168 * T - 0.0016300 * T * T + \
-        (T * T * T / 545868) - (T * T * T * T / 113065000)
+    D = (((-1.0 / 113065000 * T + 1.0 / 545868) * T - 0.0016300) * T +
+         445267.1115168) * T + 297.8502042
     return D % 360
 
 
+@njit(['f8(f8)', 'f8[:](f8[:])'], cache=True, fastmath=True)
 def mean_anomaly_moon(T):
     """
     See Chapter 45 (Astronomical Algorithms, Jean Meeus)
@@ -283,11 +444,12 @@ def mean_anomaly_moon(T):
     :arg:    T -> Julian centuries
     :return: float
     """
-    M = 134.9634114 + 477198.8676313 * T + 0.0089970 * T * T + \
-        (T * T * T / 69699) - (T * T * T * T / 14712000)
+    M = (((-1.0 / 14712000 * T + 1.0 / 69699) * T + 0.0089970) * T +
+         477198.8676313) * T + 134.9634114
     return M % 360
 
 
+@njit(['f8(f8)', 'f8[:](f8[:])'], cache=True, fastmath=True)
 def mean_latitude_moon(T):
     """
     See Chapter 45 (Astronomical Algorithms, Jean Meeus)
@@ -295,11 +457,25 @@ def mean_latitude_moon(T):
     :arg:    T -> Julian centuries
     :return: float
     """
-    F = 93.2720993 + 483202.0175273 * T - 0.0034029 * T * T - \
-        (T * T * T / 3526000) + (T * T * T * T / 863310000)
+    F = (((1.0 / 863310000 * T - 1.0 / 3526000) * T - 0.0034029) * T +
+         483202.0175273) * T + 93.2720993
     return F % 360
 
 
+@njit(['UniTuple(f8, 4)(f8)', 'UniTuple(f8[:], 4)(f8[:])'], cache=True, fastmath=True)
+def _mean_elements(T):
+    """
+    Evaluates the four lunar mean-element polynomials in one jitted call;
+    inlined together LLVM can share the powers of T between them instead
+    of each caller paying for four separate evaluations
+    :arg:    T -> Julian centuries
+    :return: (L_prime, D, M_prime, F)
+    """
+    return (light_time_moon(T), mean_elongation_moon(T),
+            mean_anomaly_moon(T), mean_latitude_moon(T))
+
+
+@njit(['f8(f8)', 'f8[:](f8[:])'], cache=True, fastmath=True)
 def action_venus(T):
     """
     See Chapter 45 (Astronomical Algorithms, Jean Meeus)
@@ -311,6 +487,7 @@ def action_venus(T):
     return A1 % 360
 
 
+@njit(['f8(f8)', 'f8[:](f8[:])'], cache=True, fastmath=True)
 def action_jupiter(T):
     """
     See Chapter 45 (Astronomical Algorithms, Jean Meeus)
@@ -322,6 +499,7 @@ def action_jupiter(T):
     return A2 % 360
 
 
+@njit(['f8(f8)', 'f8[:](f8[:])'], cache=True, fastmath=True)
 def action_earth(T):
     """
     See Chapter 45 (Astronomical Algorithms, Jean Meeus)
@@ -333,6 +511,126 @@ def action_earth(T):
     return A3 % 360
 
 
+# Periodic term tables for the three Kepler sums (Chapter 45, Astronomical
+# Algorithms, Jean Meeus), stored structure-of-arrays style: each row of a
+# *_MULT table holds the integer multipliers of (D, M, M_prime, F) for one
+# term, *_COEF holds its amplitude and *_EPOW the power of E it carries.
+# The tables live as .npy files next to the module and are mapped read-only
+# at import: contiguous typed memory straight off the page cache, with no
+# parse cost and nothing copied until a page is actually touched
+
+_TERMS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          "terms")
+
+
+def _load_terms(stem):
+    """
+    Maps one periodic-term table (terms/<stem>.npy) read-only
+    :arg:    stem -> table name, e.g. "lon_mult"
+    :return: np.memmap-backed ndarray
+    """
+    return np.load(os.path.join(_TERMS_DIR, stem + ".npy"), mmap_mode="r")
+
+
+_LON_MULT = _load_terms("lon_mult")
+_LON_COEF = _load_terms("lon_coef")
+_LON_EPOW = _load_terms("lon_epow")
+_DIST_MULT = _load_terms("dist_mult")
+_DIST_COEF = _load_terms("dist_coef")
+_DIST_EPOW = _load_terms("dist_epow")
+_LAT_MULT = _load_terms("lat_mult")
+_LAT_COEF = _load_terms("lat_coef")
+_LAT_EPOW = _load_terms("lat_epow")
+
+
+# Float copies of the multiplier tables for the jitted scalar kernels
+# below: homogeneous float64 loads keep LLVM's vectorizer happy where
+# mixed int8/float arithmetic does not
+_LON_MULT_F = _LON_MULT.astype(np.float64)
+_DIST_MULT_F = _DIST_MULT.astype(np.float64)
+_LAT_MULT_F = _LAT_MULT.astype(np.float64)
+
+
+# The three lunar series share the same (D, M, M_prime, F) argument
+# vector, so the array path can evaluate them in one fused np.sin pass
+# over the stacked tables; the quarter-turn phase column converts the
+# distance series' cosines into sines (cos x = sin(x + 90 degrees))
+_ALL_MULT = np.vstack((_LON_MULT, _DIST_MULT, _LAT_MULT))
+_ALL_COEF = np.concatenate((_LON_COEF, _DIST_COEF, _LAT_COEF))
+_ALL_EPOW = np.concatenate((_LON_EPOW, _DIST_EPOW, _LAT_EPOW))
+_LON_END = _LON_COEF.size
+_DIST_END = _LON_END + _DIST_COEF.size
+_ALL_PHASE = np.zeros(_ALL_COEF.size)
+_ALL_PHASE[_LON_END:_DIST_END] = math.pi / 2
+# the amplitudes carry ~4 significant figures, so the batch path can
+# multiply them in float32 (half the memory traffic, twice the SIMD
+# lanes); the angles and the final accumulation stay float64
+_ALL_COEF32 = _ALL_COEF.astype(np.float32)
+
+
+@njit('f8(f8, f8, f8, f8, f8, f8, f8, f8)', cache=True, fastmath=True)
+def _kepler_longitude_kernel(D, M, M_prime, F, E, A1, A2, L_prime):
+    """
+    Scalar jitted kernel for kepler_coeff_longitude; reads the module-level
+    term tables, which numba captures as typed constants
+    """
+    e_lut = np.empty(3)
+    e_lut[0] = 1.0
+    e_lut[1] = E
+    e_lut[2] = E * E
+    l = 0.0
+    for i in range(_LON_COEF.size):
+        ang = (_LON_MULT_F[i, 0] * D + _LON_MULT_F[i, 1] * M +
+               _LON_MULT_F[i, 2] * M_prime + _LON_MULT_F[i, 3] * F) * _D2R
+        l += _LON_COEF[i] * e_lut[_LON_EPOW[i]] * math.sin(ang)
+    l += 3958 * math.sin(A1 * _D2R) + \
+         1962 * math.sin((L_prime - F) * _D2R) + \
+         318 * math.sin(A2 * _D2R)
+    return l
+
+
+@njit('f8(f8, f8, f8, f8, f8)', cache=True, fastmath=True)
+def _kepler_distance_kernel(D, M, M_prime, F, E):
+    """
+    Scalar jitted kernel for kepler_coeff_distance; reads the module-level
+    term tables, which numba captures as typed constants
+    """
+    e_lut = np.empty(3)
+    e_lut[0] = 1.0
+    e_lut[1] = E
+    e_lut[2] = E * E
+    r = 0.0
+    for i in range(_DIST_COEF.size):
+        ang = (_DIST_MULT_F[i, 0] * D + _DIST_MULT_F[i, 1] * M +
+               _DIST_MULT_F[i, 2] * M_prime + _DIST_MULT_F[i, 3] * F) * _D2R
+        r += _DIST_COEF[i] * e_lut[_DIST_EPOW[i]] * math.cos(ang)
+    return r
+
+
+@njit('f8(f8, f8, f8, f8, f8, f8, f8, f8)', cache=True, fastmath=True)
+def _kepler_latitude_kernel(D, M, M_prime, F, E, L_prime, A3, A1):
+    """
+    Scalar jitted kernel for kepler_coeff_latitude; reads the module-level
+    term tables, which numba captures as typed constants
+    """
+    e_lut = np.empty(3)
+    e_lut[0] = 1.0
+    e_lut[1] = E
+    e_lut[2] = E * E
+    b = 0.0
+    for i in range(_LAT_COEF.size):
+        ang = (_LAT_MULT_F[i, 0] * D + _LAT_MULT_F[i, 1] * M +
+               _LAT_MULT_F[i, 2] * M_prime + _LAT_MULT_F[i, 3] * F) * _D2R
+        b += _LAT_COEF[i] * e_lut[_LAT_EPOW[i]] * math.sin(ang)
+    b += - 2235 * math.sin(L_prime * _D2R) \
+         + 382 * math.sin(A3 * _D2R) \
+         + 175 * math.sin((A1 - F) * _D2R) \
+         + 175 * math.sin((A1 + F) * _D2R) \
+         + 127 * math.sin((L_prime - M_prime) * _D2R) \
+         - 115 * math.sin((L_prime + M_prime) * _D2R)
+    return b
+
+
 def kepler_coeff_longitude(D, M, M_prime, F, E, A1, A2, L_prime):
     """
     See Chapter 45 (Astronomical Algorithms, Jean Meeus)
@@ -347,68 +645,17 @@ def kepler_coeff_longitude(D, M, M_prime, F, E, A1, A2, L_prime):
     :arg:    L_prime -> Effect of light-time
     :return: float (10 ^ -6 degrees)
     """
-    l = 6288774 * math.sin(math.radians(M_prime)) \
-        + 1274027 * math.sin(math.radians(2 * D - M_prime)) \
-        + 658314 * math.sin(math.radians(2 * D)) \
-        + 213618 * math.sin(math.radians(2 * M_prime)) \
-        - 185116 * math.sin(math.radians(M)) * E \
-        - 114332 * math.sin(math.radians(2 * F)) \
-        + 58793 * math.sin(math.radians(2 * D - 2 * M_prime)) \
-        + 57066 * math.sin(math.radians(2 * D - M - M_prime)) * E \
-        + 53322 * math.sin(math.radians(2 * D + M_prime)) \
-        + 45758 * math.sin(math.radians(2 * D - M)) * E \
-        - 40923 * math.sin(math.radians(M - M_prime)) * E \
-        - 34720 * math.sin(math.radians(D)) \
-        - 30383 * math.sin(math.radians(M + M_prime)) * E \
-        + 15327 * math.sin(math.radians(2 * D - 2 * F)) \
-        - 12528 * math.sin(math.radians(M_prime + 2 * F)) \
-        + 10980 * math.sin(math.radians(M_prime - 2 * F)) \
-        + 10675 * math.sin(math.radians(4 * D - M_prime)) \
-        + 10034 * math.sin(math.radians(3 * M_prime)) \
-        + 8548 * math.sin(math.radians(4 * D - 2 * M_prime)) \
-        - 7888 * math.sin(math.radians(2 * D + M - M_prime)) * E \
-        - 6766 * math.sin(math.radians(2 * D + M)) * E \
-        - 5163 * math.sin(math.radians(D - M_prime)) \
-        + 4987 * math.sin(math.radians(D + M)) * E \
-        + 4036 * math.sin(math.radians(2 * D - M + M_prime)) * E \
-        + 3994 * math.sin(math.radians(2 * D + 2 * M_prime)) \
-        + 3861 * math.sin(math.radians(4 * D)) \
-        + 3665 * math.sin(math.radians(2 * D - 3 * M_prime)) \
-        - 2689 * math.sin(math.radians(M - 2 * M_prime)) * E \
-        - 2602 * math.sin(math.radians(2 * D - M_prime + 2 * F)) \
-        + 2390 * math.sin(math.radians(2 * D - M - 2 * M_prime)) * E \
-        - 2348 * math.sin(math.radians(D + M_prime)) \
-        + 2236 * math.sin(math.radians(2 * D - 2 * M)) * E * E \
-        - 2120 * math.sin(math.radians(M + 2 * M_prime)) * E \
-        - 2069 * math.sin(math.radians(2 * M)) * E * E \
-        + 2048 * math.sin(math.radians(2 * D - 2 * M - M_prime)) * E * E \
-        - 1773 * math.sin(math.radians(2 * D + M_prime - 2 * F)) \
-        - 1595 * math.sin(math.radians(2 * D + 2 * F)) \
-        + 1215 * math.sin(math.radians(4 * D - M - M_prime)) * E \
-        - 1110 * math.sin(math.radians(2 * M_prime + 2 * F)) \
-        - 892 * math.sin(math.radians(3 * D - M_prime)) \
-        - 810 * math.sin(math.radians(2 * D + M + M_prime)) * E \
-        + 759 * math.sin(math.radians(4 * D - M - 2 * M_prime)) * E \
-        - 713 * math.sin(math.radians(2 * M - M_prime)) * E * E \
-        - 700 * math.sin(math.radians(2 * D + 2 * M - M_prime)) * E * E \
-        + 691 * math.sin(math.radians(2 * D + M - 2 * M_prime)) * E \
-        + 596 * math.sin(math.radians(2 * D - M - 2 * F)) * E \
-        + 549 * math.sin(math.radians(4 * D + M_prime)) \
-        + 537 * math.sin(math.radians(4 * M_prime)) \
-        + 520 * math.sin(math.radians(4 * D - M)) * E \
-        - 487 * math.sin(math.radians(D - 2 * M_prime)) \
-        - 399 * math.sin(math.radians(2 * D + M - 2 * F)) * E \
-        - 381 * math.sin(math.radians(2 * M_prime - 2 * F)) \
-        + 351 * math.sin(math.radians(D + M + M_prime)) * E \
-        - 340 * math.sin(math.radians(3 * D - 2 * M_prime)) \
-        + 330 * math.sin(math.radians(4 * D - 3 * M_prime)) \
-        + 327 * math.sin(math.radians(2 * D - M + 2 * M_prime)) * E \
-        - 323 * math.sin(math.radians(2 * M + M_prime)) * E * E \
-        + 299 * math.sin(math.radians(D + M - M_prime)) * E \
-        + 294 * math.sin(math.radians(2 * D + 3 * M_prime))
-    l += 3958 * math.sin(math.radians(A1)) + \
-         1962 * math.sin(math.radians(L_prime - F)) + \
-         318 * math.sin(math.radians(A2))
+    if np.ndim(D) == 0:
+        return _kepler_longitude_kernel(float(D), float(M), float(M_prime),
+                                        float(F), float(E), float(A1),
+                                        float(A2), float(L_prime))
+    angles = np.radians(_LON_MULT @ np.stack([D, M, M_prime, F]))
+    e_pows = np.stack((np.ones_like(E), E, E * E))
+    l = (_LON_COEF[:, None] * e_pows[_LON_EPOW] *
+         np.sin(angles)).sum(axis=0)
+    l += 3958 * np.sin(np.radians(A1)) + \
+         1962 * np.sin(np.radians(L_prime - F)) + \
+         318 * np.sin(np.radians(A2))
     return l
 
 
@@ -423,52 +670,13 @@ def kepler_coeff_distance(D, M, M_prime, F, E):
     :arg:    E -> Eccentricity of the Earths orbit
     :return: float (10 ^ -3 km)
     """
-    r = - 20905355 * math.cos(math.radians(M_prime)) \
-        - 3699111 * math.cos(math.radians(2 * D - M_prime)) \
-        - 2955968 * math.cos(math.radians(2 * D)) \
-        - 569925 * math.cos(math.radians(2 * M_prime)) \
-        + 48888 * math.cos(math.radians(M)) * E \
-        - 3149 * math.cos(math.radians(2 * F)) \
-        + 246158 * math.cos(math.radians(2 * D - 2 * M_prime)) \
-        - 152138 * math.cos(math.radians(2 * D - M - M_prime)) * E \
-        - 170733 * math.cos(math.radians(2 * D + M_prime)) \
-        - 204586 * math.cos(math.radians(2 * D - M)) * E \
-        - 129620 * math.cos(math.radians(M - M_prime)) * E \
-        + 108743 * math.cos(math.radians(D)) \
-        + 104755 * math.cos(math.radians(M + M_prime)) * E \
-        + 10321 * math.cos(math.radians(2 * D - 2 * F)) \
-        + 79661 * math.cos(math.radians(M_prime - 2 * F)) \
-        - 34782 * math.cos(math.radians(4 * D - M_prime)) \
-        - 23210 * math.cos(math.radians(3 * M_prime)) \
-        - 21636 * math.cos(math.radians(4 * D - 2 * M_prime)) \
-        + 24208 * math.cos(math.radians(2 * D + M - M_prime)) * E \
-        + 30824 * math.cos(math.radians(2 * D + M)) * E \
-        - 8379 * math.cos(math.radians(D - M_prime)) \
-        - 16675 * math.cos(math.radians(D + M)) * E \
-        - 12831 * math.cos(math.radians(2 * D - M + M_prime)) * E \
-        - 10445 * math.cos(math.radians(2 * D + 2 * M_prime)) \
-        - 11650 * math.cos(math.radians(4 * D)) \
-        + 14403 * math.cos(math.radians(2 * D - 3 * M_prime)) \
-        - 7003 * math.cos(math.radians(M - 2 * M_prime)) * E \
-        + 10056 * math.cos(math.radians(2 * D - M - 2 * M_prime)) * E \
-        + 6322 * math.cos(math.radians(D + M_prime)) \
-        - 9884 * math.cos(math.radians(2 * D - 2 * M)) * E * E \
-        + 5751 * math.cos(math.radians(M + 2 * M_prime)) * E \
-        - 4950 * math.cos(math.radians(2 * D - 2 * M - M_prime)) * E * E \
-        + 4130 * math.cos(math.radians(2 * D + M_prime - 2 * F)) \
-        - 3958 * math.cos(math.radians(4 * D - M - M_prime)) * E \
-        + 3258 * math.cos(math.radians(3 * D - M_prime)) \
-        + 2616 * math.cos(math.radians(2 * D + M + M_prime)) * E \
-        - 1897 * math.cos(math.radians(4 * D - M - 2 * M_prime)) * E \
-        - 2117 * math.cos(math.radians(2 * M - M_prime)) * E * E \
-        + 2354 * math.cos(math.radians(2 * D + 2 * M - M_prime)) * E * E \
-        - 1423 * math.cos(math.radians(4 * D + M_prime)) \
-        - 1117 * math.cos(math.radians(4 * M_prime)) \
-        - 1571 * math.cos(math.radians(4 * D - M)) * E \
-        - 1739 * math.cos(math.radians(D - 2 * M_prime)) \
-        - 4421 * math.cos(math.radians(2 * M_prime - 2 * F)) \
-        + 1165 * math.cos(math.radians(2 * M + M_prime)) * E * E \
-        + 8752 * math.cos(math.radians(2 * D - M_prime - 2 * F))
+    if np.ndim(D) == 0:
+        return _kepler_distance_kernel(float(D), float(M), float(M_prime),
+                                       float(F), float(E))
+    angles = np.radians(_DIST_MULT @ np.stack([D, M, M_prime, F]))
+    e_pows = np.stack((np.ones_like(E), E, E * E))
+    r = (_DIST_COEF[:, None] * e_pows[_DIST_EPOW] *
+         np.cos(angles)).sum(axis=0)
     return r
 
 
@@ -488,75 +696,54 @@ def kepler_coeff_latitude(D, M, M_prime, F, E, L_prime, A3, A1):
     :arg:    A1 -> Action due to Venus
     :return: float (10 ^ -6 degrees)
     """
-    b = 5128122 * math.sin(math.radians(F)) \
-        + 280602 * math.sin(math.radians(M_prime + F)) \
-        + 277693 * math.sin(math.radians(M_prime - F)) \
-        + 173237 * math.sin(math.radians(2 * D - F)) \
-        + 55413 * math.sin(math.radians(2 * D - M_prime + F)) \
-        + 46271 * math.sin(math.radians(2 * D - M_prime - F)) \
-        + 32573 * math.sin(math.radians(2 * D + F)) \
-        + 17198 * math.sin(math.radians(2 * M_prime + F)) \
-        + 9266 * math.sin(math.radians(2 * D + M_prime - F)) \
-        + 8822 * math.sin(math.radians(2 * M_prime - F)) \
-        + 8216 * math.sin(math.radians(2 * D - M - F)) * E \
-        + 4324 * math.sin(math.radians(2 * D - 2 * M_prime - F)) \
-        + 4200 * math.sin(math.radians(2 * D + M_prime + F)) \
-        - 3359 * math.sin(math.radians(2 * D + M - F)) * E \
-        + 2463 * math.sin(math.radians(2 * D - M - M_prime + F)) * E \
-        + 2211 * math.sin(math.radians(2 * D - M + F)) * E \
-        + 2065 * math.sin(math.radians(2 * D - M - M_prime - F)) * E \
-        - 1870 * math.sin(math.radians(M - M_prime - F)) * E \
-        + 1828 * math.sin(math.radians(4 * D - M_prime - F)) \
-        - 1794 * math.sin(math.radians(M + F)) * E \
-        - 1749 * math.sin(math.radians(3 * F)) \
-        - 1565 * math.sin(math.radians(M - M_prime + F)) * E \
-        - 1491 * math.sin(math.radians(D + F)) \
-        - 1475 * math.sin(math.radians(M + M_prime + F)) * E \
-        - 1410 * math.sin(math.radians(M + M_prime - F)) * E \
-        - 1344 * math.sin(math.radians(M - F)) * E \
-        - 1335 * math.sin(math.radians(D - F)) \
-        + 1107 * math.sin(math.radians(3 * M_prime + F)) \
-        + 1021 * math.sin(math.radians(4 * D - F)) \
-        + 833 * math.sin(math.radians(4 * D - M_prime + F)) \
-        + 777 * math.sin(math.radians(M_prime - 3 * F)) \
-        + 671 * math.sin(math.radians(4 * D - 2 * M_prime + F)) \
-        + 607 * math.sin(math.radians(2 * D - 3 * F)) \
-        + 596 * math.sin(math.radians(2 * D + 2 * M_prime - F)) \
-        + 491 * math.sin(math.radians(2 * D - M + M_prime - F)) * E \
-        - 451 * math.sin(math.radians(2 * D - 2 * M_prime + F)) \
-        + 439 * math.sin(math.radians(3 * M_prime - F)) \
-        + 422 * math.sin(math.radians(2 * D + 2 * M_prime + F)) \
-        + 421 * math.sin(math.radians(2 * D - 3 * M_prime - F)) \
-        - 366 * math.sin(math.radians(2 * D + M - M_prime + F)) * E \
-        - 351 * math.sin(math.radians(2 * D + M + F)) * E \
-        + 331 * math.sin(math.radians(4 * D + F)) \
-        + 315 * math.sin(math.radians(2 * D - M + M_prime + F)) * E \
-        + 302 * math.sin(math.radians(2 * D - 2 * M - F)) * E * E \
-        - 283 * math.sin(math.radians(M_prime + 3 * F)) \
-        - 229 * math.sin(math.radians(2 * D + M + M_prime - F)) * E \
-        + 223 * math.sin(math.radians(D + M - F)) * E \
-        + 223 * math.sin(math.radians(D + M + F)) * E \
-        - 220 * math.sin(math.radians(M - 2 * M_prime - F)) * E \
-        - 220 * math.sin(math.radians(2 * D + M - M_prime - F)) * E \
-        - 185 * math.sin(math.radians(D + M_prime + F)) \
-        + 181 * math.sin(math.radians(2 * D - M - 2 * M_prime - F)) * E \
-        - 177 * math.sin(math.radians(M + 2 * M_prime + F)) * E \
-        + 176 * math.sin(math.radians(4 * D - 2 * M_prime - F)) \
-        + 166 * math.sin(math.radians(4 * D - M - M_prime - F)) * E \
-        - 164 * math.sin(math.radians(D + M_prime - F)) \
-        + 132 * math.sin(math.radians(4 * D + M_prime - F)) \
-        - 119 * math.sin(math.radians(D - M_prime - F)) \
-        + 115 * math.sin(math.radians(4 * D - M - F)) * E \
-        + 107 * math.sin(math.radians(2 * D - 2 * M + F)) * E * E
-    b += - 2235 * math.sin(math.radians(L_prime)) \
-         + 382 * math.sin(math.radians(A3)) \
-         + 175 * math.sin(math.radians(A1 - F)) \
-         + 175 * math.sin(math.radians(A1 + F)) \
-         + 127 * math.sin(math.radians(L_prime - M_prime)) \
-         - 115 * math.sin(math.radians(L_prime + M_prime))
+    if np.ndim(D) == 0:
+        return _kepler_latitude_kernel(float(D), float(M), float(M_prime),
+                                       float(F), float(E), float(L_prime),
+                                       float(A3), float(A1))
+    angles = np.radians(_LAT_MULT @ np.stack([D, M, M_prime, F]))
+    e_pows = np.stack((np.ones_like(E), E, E * E))
+    b = (_LAT_COEF[:, None] * e_pows[_LAT_EPOW] *
+         np.sin(angles)).sum(axis=0)
+    b += - 2235 * np.sin(np.radians(L_prime)) \
+         + 382 * np.sin(np.radians(A3)) \
+         + 175 * np.sin(np.radians(A1 - F)) \
+         + 175 * np.sin(np.radians(A1 + F)) \
+         + 127 * np.sin(np.radians(L_prime - M_prime)) \
+         - 115 * np.sin(np.radians(L_prime + M_prime))
     return b
 
 
+def _kepler_sums_array(D, M, M_prime, F, E, A1, A2, A3, L_prime):
+    """
+    Fused array evaluation of all three Kepler summations: one matrix
+    product and one np.sin call over the stacked term tables instead of
+    three separate passes, then a slice-and-sum per series. Additive
+    corrections match kepler_coeff_longitude/latitude
+    :arg:    D, M, M_prime, F, E, A1, A2, A3, L_prime -> as in the
+             kepler_coeff_* functions (np.ndarray)
+    :return: (sl, sr, sb) summations as np.ndarray
+    """
+    angles = np.radians(_ALL_MULT @ np.stack([D, M, M_prime, F])) + \
+        _ALL_PHASE[:, None]
+    e_pows = np.stack((np.ones_like(E), E, E * E)).astype(np.float32)
+    terms = _ALL_COEF32[:, None] * e_pows[_ALL_EPOW] * \
+        np.sin(angles).astype(np.float32)
+    sl = terms[:_LON_END].sum(axis=0, dtype=np.float64)
+    sr = terms[_LON_END:_DIST_END].sum(axis=0, dtype=np.float64)
+    sb = terms[_DIST_END:].sum(axis=0, dtype=np.float64)
+    sl += 3958 * np.sin(np.radians(A1)) + \
+        1962 * np.sin(np.radians(L_prime - F)) + \
+        318 * np.sin(np.radians(A2))
+    sb += - 2235 * np.sin(np.radians(L_prime)) \
+         + 382 * np.sin(np.radians(A3)) \
+         + 175 * np.sin(np.radians(A1 - F)) \
+         + 175 * np.sin(np.radians(A1 + F)) \
+         + 127 * np.sin(np.radians(L_prime - M_prime)) \
+         - 115 * np.sin(np.radians(L_prime + M_prime))
+    return sl, sr, sb
+
+
+@njit(['f8(f8, f8)', 'f8[:](f8[:], f8[:])'], cache=True, fastmath=True)
 def apparent_longitude_moon(L_prime, sl):
     """
     See Chapter 45 (Astronomical Algorithms, Jean Meeus)
@@ -569,6 +756,7 @@ def apparent_longitude_moon(L_prime, sl):
     return l
 
 
+@njit(['f8(f8)', 'f8[:](f8[:])'], cache=True, fastmath=True)
 def apparent_latitude_moon(sb):
     """
     See Chapter 45 (Astronomical Algorithms, Jean Meeus)
@@ -580,6 +768,7 @@ def apparent_latitude_moon(sb):
     return b
 
 
+@njit(['f8(f8)', 'f8[:](f8[:])'], cache=True, fastmath=True)
 def distance_moon_earth(sr):
     """
     See Chapter 45 (Astronomical Algorithms, Jean Meeus)
@@ -591,145 +780,235 @@ def distance_moon_earth(sr):
     return d
 
 
-def apparent_right_ascension_moon(l_moon, b_moon, e_moon):
+@njit(['UniTuple(f8, 2)(f8, f8, f8)',
+       'UniTuple(f8[:], 2)(f8[:], f8[:], f8[:])'], cache=True, fastmath=True)
+def _apparent_equatorial_moon_rad(l_r, b_r, e_r):
     """
-    See Chapter 12 (Astronomical Algorithms, Jean Meeus)
-    Calculates the apparent latitude
-    :arg:    l_moon -> geocentric longitude
-    :arg:    b_moon -> geocentric latitude
-    :arg:    e_moon -> obliquity of the ecliptic
-    :return: float
+    Radian-native core of apparent_equatorial_moon: takes and returns
+    radians so the pipeline can avoid degree round-trips between stages
+    :arg:    l_r -> geocentric longitude (radians)
+    :arg:    b_r -> geocentric latitude (radians)
+    :arg:    e_r -> obliquity of the ecliptic (radians)
+    :return: (alpha, delta) in radians
     """
-    a = math.atan2(math.sin(math.radians(l_moon)) *
-                   math.cos(math.radians(e_moon)) -
-                   math.tan(math.radians(b_moon)) *
-                   math.sin(math.radians(e_moon)),
-                   math.cos(math.radians(l_moon)))
-    return math.degrees(a)
+    sin_l, cos_l = np.sin(l_r), np.cos(l_r)
+    sin_b, cos_b = np.sin(b_r), np.cos(b_r)
+    sin_e, cos_e = np.sin(e_r), np.cos(e_r)
+    a = np.arctan2(sin_l * cos_e - (sin_b / cos_b) * sin_e, cos_l)
+    d = np.arcsin(sin_b * cos_e + cos_b * sin_e * sin_l)
+    return a, d
 
 
-def apparent_right_declination_moon(l_moon, b_moon, e_moon):
+@njit(['UniTuple(f8, 2)(f8, f8, f8)',
+       'UniTuple(f8[:], 2)(f8[:], f8[:], f8[:])'], cache=True, fastmath=True)
+def apparent_equatorial_moon(l_moon, b_moon, e_moon):
     """
     See Chapter 12 (Astronomical Algorithms, Jean Meeus)
-    Calculates the apparent longitude
+    Calculates the apparent right ascension (alpha) and declination (delta)
+    of the moon; degree-in/degree-out wrapper over the radian-native core
     :arg:    l_moon -> geocentric longitude
     :arg:    b_moon -> geocentric latitude
     :arg:    e_moon -> obliquity of the ecliptic
-    :return: float
+    :return: (alpha, delta)
     """
-    d = math.asin(math.sin(math.radians(b_moon)) *
-                  math.cos(math.radians(e_moon)) +
-                  math.cos(math.radians(b_moon)) *
-                  math.sin(math.radians(e_moon)) *
-                  math.sin(math.radians(l_moon)))
-    return math.degrees(d)
+    a, d = _apparent_equatorial_moon_rad(np.radians(l_moon),
+                                         np.radians(b_moon),
+                                         np.radians(e_moon))
+    return np.degrees(a), np.degrees(d)
 
 
-def delta_epsilon(T):
+@njit(['f8(f8, f8, f8)', 'f8[:](f8[:], f8[:], f8[:])'], cache=True, fastmath=True)
+def delta_epsilon(O, L, L_prime):
     """
     See Chapter 21 (Astronomical Algorithms, Jean Meeus)
     Calculations the nutation in the obliquity of the ecliptic
-    :arg:    T -> Julian centuries
+    :arg:    O -> Omega (see omega(T))
+    :arg:    L -> Mean longitude of the sun
+    :arg:    L_prime -> Mean longitude of the moon
     :return: float
     """
-    O = omega(T)
-    L = mean_longitude_sun(T)
-    L_prime = mean_longitude_moon(T)
-    de = 0.002555556 * math.cos(math.radians(O)) + \
-         0.0001583333 * math.cos(math.radians(2 * L)) + \
-         0.00002777778 * math.cos(math.radians(2 * L_prime)) + \
-         0.000025 * math.cos(math.radians(2 * O))
+    de = 0.002555556 * np.cos(np.radians(O)) + \
+         0.0001583333 * np.cos(np.radians(2 * L)) + \
+         0.00002777778 * np.cos(np.radians(2 * L_prime)) + \
+         0.000025 * np.cos(np.radians(2 * O))
     return de
 
 
-def delta_shi(T):
+@njit(['f8(f8, f8, f8)', 'f8[:](f8[:], f8[:], f8[:])'], cache=True, fastmath=True)
+def delta_shi(O, L, L_prime):
     """
     See Chapter 21 (Astronomical Algorithms, Jean Meeus)
     Calculations the nutation in the longitude
-    :arg:    T -> Julian centuries
+    :arg:    O -> Omega (see omega(T))
+    :arg:    L -> Mean longitude of the sun
+    :arg:    L_prime -> Mean longitude of the moon
     :return: float
     """
-    O = omega(T)
-    L = mean_longitude_sun(T)
-    L_prime = mean_longitude_moon(T)
-    ds = 0.004777778 * math.sin(math.radians(O)) - \
-         0.0003666667 * math.sin(math.radians(2 * L)) + \
-         0.00006388889 * math.sin(math.radians(2 * L_prime)) + \
-         0.00005833333 * math.sin(math.radians(2 * O))
+    ds = 0.004777778 * np.sin(np.radians(O)) - \
+         0.0003666667 * np.sin(np.radians(2 * L)) + \
+         0.00006388889 * np.sin(np.radians(2 * L_prime)) + \
+         0.00005833333 * np.sin(np.radians(2 * O))
     return ds
 
 
-def get_coordinates_sun(y, m, d):
+SunCoords = collections.namedtuple(
+    'SunCoords',
+    'alpha delta lam eo distance alpha_rad delta_rad lam_rad')
+MoonCoords = collections.namedtuple(
+    'MoonCoords',
+    'alpha delta lam beta eo distance alpha_rad delta_rad lam_rad beta_rad')
+
+
+def get_coordinates_sun_array(T):
     """
-    Calculates and returns the equatorial coordinates of the Sun
-    :arg:    y -> year
-    :arg:    m -> month
-    :arg:    d -> day
-    :return: {"alpha": float, "delta": float, "lambda": float,
-              "ecliptic_obliquity: "float, "distance_to_earth": float}
+    Batch version of get_coordinates_sun working directly in Julian
+    centuries, so one call evaluates any number of dates at once
+    :arg:    T -> Julian centuries (float or np.ndarray)
+    :return: {"alpha": array, "delta": array, "lambda": array,
+              "ecliptic_obliquity: "array, "distance_to_earth": array}
     """
-    T = jde_to_T(date_to_jde(y, m, d))
-    Lo = mean_longitude_sun(T) % 360
+    O = omega(T)
+    L_sun_mean = mean_longitude_sun(T)
+    L_moon_mean = mean_longitude_moon(T)
+    Lo = L_sun_mean % 360
     M = mean_anomaly_sun(T)
     C = center_of_sun(T, M)
     L = true_longitude_sun(Lo, C)
-    al = apparent_longitude_sun(L, T)
-    e = ecliptic_obliquity(T) + delta_epsilon(T)
-    a = apparent_right_ascension_sun(e, al, T)
-    d = apparent_right_declination_sun(e, al, T)
+    al = apparent_longitude_sun(L, O)
+    e = ecliptic_obliquity(T) + delta_epsilon(O, L_sun_mean, L_moon_mean)
+    a_r, d_r = _apparent_equatorial_sun_rad(np.radians(e), np.radians(al),
+                                            np.radians(O))
+    a = np.degrees(a_r)
+    d = np.degrees(d_r)
     ec = eccentricity_sun_earth(T)
     v = true_anomaly_sun(M, C)
-    R = distance_sun_earth(ec, v) * 149597870.7  # AU to km
+    R = distance_sun_earth(ec, v) * _AU_KM
     output = {
                 "alpha": a,
                 "delta": d,
                 "lambda": al,
                 "ecliptic_obliquity": e,
-                "distance_to_earth": R
+                "distance_to_earth": R,
+                "alpha_rad": a_r,
+                "delta_rad": d_r,
+                "lambda_rad": np.radians(al)
     }
     return output
 
 
-def get_coordinates_moon(y, m, d):
+def get_coordinates_sun(y, m, d):
     """
-    Calculates and returns the equatorial coordinates of the Sun
+    Calculates and returns the equatorial coordinates of the Sun as a
+    SunCoords namedtuple (plain tuple unpack, no dict allocation or
+    string hashing on the hot path)
     :arg:    y -> year
     :arg:    m -> month
     :arg:    d -> day
-    :return: {"alpha": float, "delta": float, "lambda": float, "beta": float,
+    :return: SunCoords
+    """
+    T = jde_to_T(date_to_jde(y, m, d))
+    out = get_coordinates_sun_array(np.float64(T))
+    return SunCoords(float(out["alpha"]), float(out["delta"]),
+                     float(out["lambda"]), float(out["ecliptic_obliquity"]),
+                     float(out["distance_to_earth"]), float(out["alpha_rad"]),
+                     float(out["delta_rad"]), float(out["lambda_rad"]))
+
+
+def get_coordinates_sun_dict(y, m, d):
+    """
+    Dict version of get_coordinates_sun for external callers that want
+    the original mapping interface
+    :arg:    y -> year
+    :arg:    m -> month
+    :arg:    d -> day
+    :return: {"alpha": float, "delta": float, "lambda": float,
               "ecliptic_obliquity: "float, "distance_to_earth": float}
     """
     T = jde_to_T(date_to_jde(y, m, d))
-    L_prime = light_time_moon(T)
-    D = mean_elongation_moon(T)
+    out = get_coordinates_sun_array(np.float64(T))
+    return {k: float(v) for k, v in out.items()}
+
+
+def get_coordinates_moon_array(T):
+    """
+    Batch version of get_coordinates_moon working directly in Julian
+    centuries, so one call evaluates any number of dates at once
+    :arg:    T -> Julian centuries (float or np.ndarray)
+    :return: {"alpha": array, "delta": array, "lambda": array, "beta": array,
+              "ecliptic_obliquity: "array, "distance_to_earth": array}
+    """
+    L_prime, D, M_prime, F = _mean_elements(T)
     M = mean_anomaly_sun(T)
-    M_prime = mean_anomaly_moon(T)
-    F = mean_latitude_moon(T)
     A1 = action_venus(T)
     A2 = action_jupiter(T)
     A3 = action_earth(T)
     E = eccentricity(T)
-    sl = kepler_coeff_longitude(D, M, M_prime, F, E, A1, A2, L_prime)
-    sr = kepler_coeff_distance(D, M, M_prime, F, E)
-    sb = kepler_coeff_latitude(D, M, M_prime, F, E, L_prime, A3, A1)
+    if np.ndim(T) == 0:
+        sl = kepler_coeff_longitude(D, M, M_prime, F, E, A1, A2, L_prime)
+        sr = kepler_coeff_distance(D, M, M_prime, F, E)
+        sb = kepler_coeff_latitude(D, M, M_prime, F, E, L_prime, A3, A1)
+    else:
+        sl, sr, sb = _kepler_sums_array(D, M, M_prime, F, E, A1, A2, A3,
+                                        L_prime)
     l_moon = apparent_longitude_moon(L_prime, sl)
     b_moon = apparent_latitude_moon(sb)
-    d_moon = distance_moon_earth(sr)
-    e_moon = ecliptic_obliquity(T)
-    a_moon = apparent_right_ascension_moon(l_moon, b_moon, e_moon) 
-    d_moon = apparent_right_declination_moon(l_moon, b_moon, e_moon)
     d = distance_moon_earth(sr)
+    e_moon = ecliptic_obliquity(T)
+    a_moon_r, d_moon_r = _apparent_equatorial_moon_rad(np.radians(l_moon),
+                                                       np.radians(b_moon),
+                                                       np.radians(e_moon))
+    a_moon = np.degrees(a_moon_r)
+    d_moon = np.degrees(d_moon_r)
     output = {
                 "alpha": a_moon,
                 "delta": d_moon,
                 "lambda": l_moon,
                 "beta": b_moon,
                 "ecliptic_obliquity": e_moon,
-                "distance_to_earth": d
+                "distance_to_earth": d,
+                "alpha_rad": a_moon_r,
+                "delta_rad": d_moon_r,
+                "lambda_rad": np.radians(l_moon),
+                "beta_rad": np.radians(b_moon)
     }
     return output
 
 
+def get_coordinates_moon(y, m, d):
+    """
+    Calculates and returns the equatorial coordinates of the Moon as a
+    MoonCoords namedtuple (plain tuple unpack, no dict allocation or
+    string hashing on the hot path)
+    :arg:    y -> year
+    :arg:    m -> month
+    :arg:    d -> day
+    :return: MoonCoords
+    """
+    T = jde_to_T(date_to_jde(y, m, d))
+    out = get_coordinates_moon_array(np.float64(T))
+    return MoonCoords(float(out["alpha"]), float(out["delta"]),
+                      float(out["lambda"]), float(out["beta"]),
+                      float(out["ecliptic_obliquity"]),
+                      float(out["distance_to_earth"]),
+                      float(out["alpha_rad"]), float(out["delta_rad"]),
+                      float(out["lambda_rad"]), float(out["beta_rad"]))
+
+
+def get_coordinates_moon_dict(y, m, d):
+    """
+    Dict version of get_coordinates_moon for external callers that want
+    the original mapping interface
+    :arg:    y -> year
+    :arg:    m -> month
+    :arg:    d -> day
+    :return: {"alpha": float, "delta": float, "lambda": float, "beta": float,
+              "ecliptic_obliquity: "float, "distance_to_earth": float}
+    """
+    T = jde_to_T(date_to_jde(y, m, d))
+    out = get_coordinates_moon_array(np.float64(T))
+    return {k: float(v) for k, v in out.items()}
+
+
 def dec_deg_decomposition(angle):
     """
     See https://www.rapidtables.com/convert/number/degrees-to-degrees-minutes-seconds.html
@@ -755,14 +1034,14 @@ def get_coords(alpha, delta, distance, factor):
     :return: (x, y, z)
     """
     d_alpha, m_alpha, s_alpha = dec_deg_decomposition(alpha % 360)
-    h_alpha = d_alpha * 0.0667  # degree to hour
+    h_alpha = d_alpha * _DEG_HR
     d_delta, m_delta, s_delta = dec_deg_decomposition(delta)
     sign_delta = delta/abs(delta)
 
     # galactic coordinates
     A = (h_alpha * 15) + (m_alpha * 0.25) + (s_alpha * 0.004166)
     B = (int(d_delta) + (m_delta / 60)) + (s_delta / 3600) * sign_delta
-    C = distance * 0.00000000000010570  # km to ly
+    C = distance * _KM_LY
 
     x = (C * math.cos(B)) * math.cos(A) * 10 ** factor
     y = (C * math.cos(B)) * math.sin(A) * 10 ** factor
@@ -784,11 +1063,253 @@ def get_coords(alpha, delta, distance, factor):
     return x, y, z
 
 
+@njit('UniTuple(f8, 2)(f8)', cache=True, fastmath=True)
+def _illuminated_fraction_T(T):
+    """
+    Scalar jitted core of get_illuminated_fraction_moon: runs the whole
+    sun + moon pipeline for one Julian-century value
+    :arg:    T -> Julian centuries
+    :return: (illuminated fraction, position angle in degrees)
+    """
+    # sun
+    O = omega(T)
+    L_sun_mean = mean_longitude_sun(T)
+    L_moon_mean = mean_longitude_moon(T)
+    M = mean_anomaly_sun(T)
+    C = center_of_sun(T, M)
+    L = L_sun_mean % 360 + C
+    al = apparent_longitude_sun(L, O)
+    e = ecliptic_obliquity(T) + delta_epsilon(O, L_sun_mean, L_moon_mean)
+    a_sun_r, d_sun_r = _apparent_equatorial_sun_rad(e * _D2R,
+                                                    al * _D2R,
+                                                    O * _D2R)
+    R_sun = distance_sun_earth(eccentricity_sun_earth(T), M + C) * _AU_KM
+
+    # moon
+    L_prime, D, M_prime, F = _mean_elements(T)
+    A1 = action_venus(T)
+    A2 = action_jupiter(T)
+    A3 = action_earth(T)
+    E = eccentricity(T)
+    sl = _kepler_longitude_kernel(D, M, M_prime, F, E, A1, A2, L_prime)
+    sr = _kepler_distance_kernel(D, M, M_prime, F, E)
+    sb = _kepler_latitude_kernel(D, M, M_prime, F, E, L_prime, A3, A1)
+    l_moon = apparent_longitude_moon(L_prime, sl)
+    b_moon = apparent_latitude_moon(sb)
+    d_moon = distance_moon_earth(sr)
+    a_moon_r, d_moon_r = _apparent_equatorial_moon_rad(
+        l_moon * _D2R, b_moon * _D2R, ecliptic_obliquity(T) * _D2R)
+
+    # geocentric elongation and phase angle of the moon; shi is only
+    # needed through its sine and cosine, so skip the acos/sin round-trip
+    # with sin(acos(x)) = sqrt(1 - x^2) (shi is in [0, pi], sign is safe)
+    cos_shi = math.cos(b_moon * _D2R) * math.cos((l_moon - al) * _D2R)
+    sin_shi = math.sqrt(max(0.0, 1 - cos_shi * cos_shi))
+    i = math.atan2(R_sun * sin_shi, d_moon - R_sun * cos_shi)
+    k = (1 + math.cos(i)) / 2
+
+    # position angle of the moon (see get_illuminated_fraction_moon);
+    # sin/cos of each shared angle are paired so LLVM can emit one sincos
+    d_alpha = a_sun_r - a_moon_r
+    sin_da, cos_da = math.sin(d_alpha), math.cos(d_alpha)
+    sin_ds, cos_ds = math.sin(d_sun_r), math.cos(d_sun_r)
+    sin_dm, cos_dm = math.sin(d_moon_r), math.cos(d_moon_r)
+    x = math.atan2(cos_ds * sin_da,
+                   sin_ds * cos_dm - cos_ds * sin_dm * cos_da)
+    return k, (x * _R2D) % 360
+
+
+@njit('void(f8[:], f8[:], f8[:])', parallel=True, cache=True,
+      fastmath=True)
+def _illuminated_fraction_batch(T_arr, out_k, out_x):
+    """
+    Parallel driver for _illuminated_fraction_T: every date is independent
+    so the loop runs across all cores without the GIL
+    :arg:    T_arr -> Julian centuries (np.ndarray)
+    :arg:    out_k -> output array for the illuminated fractions
+    :arg:    out_x -> output array for the position angles
+    :return: None, fills out_k and out_x
+    """
+    for n in prange(T_arr.size):
+        k, x = _illuminated_fraction_T(T_arr[n])
+        out_k[n] = k
+        out_x[n] = x
+
+
+def illuminated_fraction_batch(T_arr):
+    """
+    Computes the illuminated fraction and position angle of the moon for
+    a whole array of dates in parallel
+    :arg:    T_arr -> Julian centuries (np.ndarray)
+    :return: (illuminated fractions, position angles in degrees)
+    """
+    T_arr = np.ascontiguousarray(T_arr, dtype=np.float64)
+    out_k = np.empty(T_arr.size)
+    out_x = np.empty(T_arr.size)
+    _illuminated_fraction_batch(T_arr, out_k, out_x)
+    return out_k, out_x
+
+
+if cfunc is not None:
+    @cfunc(types.void(types.CPointer(types.float64),
+                      types.CPointer(types.float64),
+                      types.CPointer(types.float64),
+                      types.intp), cache=True)
+    def _illum_batch_c(t_ptr, k_ptr, x_ptr, n):
+        """
+        C-ABI version of the batch driver so the illuminated fraction can
+        be computed straight from C/C++ (or a CUDA host loop) with no
+        Python call overhead; the signature as seen from C is
+        void illum_batch(double *T, double *k, double *x, ssize_t n)
+        :arg:    t_ptr -> pointer to n Julian centuries
+        :arg:    k_ptr -> pointer to n output illuminated fractions
+        :arg:    x_ptr -> pointer to n output position angles
+        :arg:    n     -> number of dates
+        :return: None, fills k_ptr and x_ptr
+        """
+        T_arr = carray(t_ptr, (n,))
+        out_k = carray(k_ptr, (n,))
+        out_x = carray(x_ptr, (n,))
+        for i in range(n):
+            k, x = _illuminated_fraction_T(T_arr[i])
+            out_k[i] = k
+            out_x[i] = x
+
+    # raw function pointer; hand this to ctypes.CFUNCTYPE, cffi or any
+    # dlsym-style caller to invoke the batch driver without the interpreter
+    illum_batch_address = _illum_batch_c.address
+else:
+    illum_batch_address = None
+
+
+
+class LunarTime:
+    """
+    One instant of ephemeris time, with every intermediate memoized as a
+    cached_property: the sun and moon positions, the phase angle and so
+    on are each computed at most once per instance, so asking for several
+    derived quantities (fraction, position angle, lunar-centric coords)
+    reruns none of the heavy trig
+    """
+
+    def __init__(self, jde):
+        self.jde = jde
+
+    @functools.cached_property
+    def T(self):
+        return jde_to_T(self.jde)
+
+    @functools.cached_property
+    def sun(self):
+        """Apparent solar coordinates (SunCoords) at this instant"""
+        out = get_coordinates_sun_array(np.float64(self.T))
+        return SunCoords(*(float(out[f]) for f in
+                           ('alpha', 'delta', 'lambda', 'ecliptic_obliquity',
+                            'distance_to_earth', 'alpha_rad', 'delta_rad',
+                            'lambda_rad')))
+
+    @functools.cached_property
+    def moon(self):
+        """Apparent lunar coordinates (MoonCoords) at this instant"""
+        out = get_coordinates_moon_array(np.float64(self.T))
+        return MoonCoords(*(float(out[f]) for f in
+                            ('alpha', 'delta', 'lambda', 'beta',
+                             'ecliptic_obliquity', 'distance_to_earth',
+                             'alpha_rad', 'delta_rad', 'lambda_rad',
+                             'beta_rad')))
+
+    @functools.cached_property
+    def cos_elongation(self):
+        """
+        Cosine of the geocentric elongation of the moon; the phase angle
+        only needs sin/cos of it, and sin(acos(x)) = sqrt(1 - x^2) is
+        both cheaper and numerically cleaner than acos followed by sin
+        """
+        sun, moon = self.sun, self.moon
+        return math.cos(moon.beta_rad) * math.cos(moon.lam_rad - sun.lam_rad)
+
+    @functools.cached_property
+    def phase_angle(self):
+        """Phase angle of the moon in radians"""
+        sun, moon = self.sun, self.moon
+        cos_shi = self.cos_elongation
+        sin_shi = math.sqrt(max(0.0, 1 - cos_shi * cos_shi))
+        return math.atan2(sun.distance * sin_shi,
+                          moon.distance - sun.distance * cos_shi)
+
+    @functools.cached_property
+    def illuminated_fraction(self):
+        # Ratio of the illuminated area of the moon to its total area.
+        # See p.315 for more information on what this ratio means.
+        return (1 + math.cos(self.phase_angle)) / 2
+
+    @functools.cached_property
+    def position_angle(self):
+        """
+        Position angle of the moon in degrees:
+        Starting at the north of the disk of the moon, this is the angle
+        swept out by the area covered by light. The cusps of this area are
+        given by x + 90 and x - 90. This sweeping angle is calculated
+        clockwise. This means that when we go from new moon to the waxing
+        period, we have a x value around 270 degrees (the western part of
+        the moon is illuminated). When we wane from full moon towards
+        first quarter however, the position angle is around 90 degrees
+        or so.
+        """
+        sun, moon = self.sun, self.moon
+        d_alpha = sun.alpha_rad - moon.alpha_rad
+        sin_da, cos_da = math.sin(d_alpha), math.cos(d_alpha)
+        sin_ds, cos_ds = math.sin(sun.delta_rad), math.cos(sun.delta_rad)
+        sin_dm, cos_dm = math.sin(moon.delta_rad), math.cos(moon.delta_rad)
+        x = math.atan2(cos_ds * sin_da,
+                       sin_ds * cos_dm - cos_ds * sin_dm * cos_da)
+        return (x * _R2D) % 360
+
+    def illuminated_fraction_dict(self):
+        """
+        Packs the memoized pieces into the output dict callers expect;
+        the coordinates returned are lunar-centric. (IMPORTANT)
+        :return: {"illuminated_fraction": float, "position_angle": float,
+                  "coords_sun": (float, float, float),
+                  "coords_earth": (float, float, float)}
+        """
+        sun, moon = self.sun, self.moon
+
+        # get solar and lunar cartesian coordinates
+        x_sun, y_sun, z_sun = get_coords(sun.alpha, sun.delta,
+                                         sun.distance, 6)
+        x_moon, y_moon, z_moon = get_coords(moon.alpha, moon.delta,
+                                            moon.distance, 6)
+
+        # make sun's coordinates lunar centric and scale them
+        x_sun -= x_moon
+        y_sun -= y_moon
+        z_sun -= z_moon
+
+        # scale earth's view of the moon to a unit sphere
+        c_moon = math.sqrt(x_moon * x_moon + y_moon * y_moon +
+                           z_moon * z_moon)
+        x_earth = -x_moon/c_moon
+        y_earth = -y_moon/c_moon
+        z_earth = -z_moon/c_moon
+
+        # output is lunar centric
+        return {
+            "illuminated_fraction": self.illuminated_fraction,
+            "position_angle": self.position_angle,
+            "coords_sun": (-x_sun, -y_sun, -z_sun),
+            "coords_earth": (x_earth, y_earth, z_earth)
+        }
+
+
 def get_illuminated_fraction_moon(y, m, d):
     """
     See Chapter 46 (Astronomical Algorithms, Jean Meeus)
     Calculates and returns the fraction of the moon that is illuminated. The
     coordinates returned is lunar-centric. (IMPORTANT)
+    Cached on (y, m, d): asking for the same instant twice returns the
+    stored result instead of rerunning the whole sun/moon pipeline, and
+    with joblib installed results also persist on disk between runs
     :arg:    y -> year
     :arg:    m -> month
     :arg:    d -> day
@@ -796,69 +1317,24 @@ def get_illuminated_fraction_moon(y, m, d):
               "coords_sun": (float, float, float),
               "coords_moon": (float, float, float)}
     """
-    sun = get_coordinates_sun(y, m, d)
-    moon = get_coordinates_moon(y, m, d)
+    t = LunarTime(date_to_jde(y, m, d))
 
     print("\nSun:")
-    for k in sun:
-        print(k, sun[k])
+    for name, value in t.sun._asdict().items():
+        print(name, value)
     print("\nMoon:")
-    for k in moon:
-        print(k, moon[k])
-
-    # geocentric elongation of the moon
-    shi = math.acos(math.cos(math.radians(moon['beta'])) * \
-                    math.cos(math.radians(moon['lambda'] - sun['lambda'])))
-    
-    # phase angle of the moon
-    i = math.atan2(sun['distance_to_earth'] * math.sin(shi),
-                   moon['distance_to_earth'] - sun['distance_to_earth'] *
-                   math.cos(shi))
-
-    k = (1 + math.cos(i)) / 2   # Ratio of the illuminated area of the moon to
-                                # its total area.
-                                # See p.315 for more information on what this
-                                # ratio means.
-
-    # Position angle of the moon:
-    # Starting at the north of the disk of the moon, this is the angle swept
-    # out by the area covered by light. The cusps of this area are given by
-    # x + 90 and x - 90. This sweeping angle is calculated clockwise.
-    # This means that when we go from new moon to the waxing period, we have
-    # a x value around 270 degrees (the western part of the moon is illuminated)
-    # When we wane from full moon towards first quarter however, the position
-    # angle is around 90 degrees or so.
-    x = math.atan2(math.cos(math.radians(sun['delta'])) *
-                   math.sin(math.radians(sun['alpha'] - moon['alpha'])),
-                   math.sin(math.radians(sun['delta'])) *
-                   math.cos(math.radians(moon['delta'])) -
-                   math.cos(math.radians(sun['delta'])) *
-                   math.sin(math.radians(moon['delta'])) *
-                   math.cos(math.radians(sun['alpha'] - moon['alpha'])))
-
-    # get solar and lunar cartesian coordinates
-    x_sun, y_sun, z_sun = get_coords(sun['alpha'], sun['delta'], sun['distance_to_earth'], 6)
-    x_moon, y_moon, z_moon = get_coords(moon['alpha'], moon['delta'], moon['distance_to_earth'], 6)
-
-    # make sun's coordinates lunar centric and scale them
-    x_sun -= x_moon
-    y_sun -= y_moon
-    z_sun -= z_moon
-
-    # scale earth's view of the moon to a unit sphere
-    c_moon = math.sqrt(x_moon * x_moon + y_moon * y_moon + z_moon * z_moon)
-    x_earth = -x_moon/c_moon
-    y_earth = -y_moon/c_moon
-    z_earth = -z_moon/c_moon
-
-    # output is lunar centric
-    output = {
-        "illuminated_fraction": k,
-        "position_angle": math.degrees(x) % 360,
-        "coords_sun": (-x_sun, -y_sun, -z_sun),
-        "coords_earth": (x_earth, y_earth, z_earth)
-    }
-    return output
+    for name, value in t.moon._asdict().items():
+        print(name, value)
+
+    return t.illuminated_fraction_dict()
+
+
+# disk layer first (when joblib is present), in-process lru layer on top
+if _disk_cache is not None:
+    get_illuminated_fraction_moon = \
+        _disk_cache.cache(get_illuminated_fraction_moon)
+get_illuminated_fraction_moon = \
+    functools.lru_cache(maxsize=4096)(get_illuminated_fraction_moon)
 
 
 def lunar_phase_ascii_art(lunar_output):
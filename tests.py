@@ -0,0 +1,49 @@
+#!/bin/python3
+
+#  AUTHOR: Pulkit Jain
+# PURPOSE: Regression tests for the date -> JDE conversion, checked in
+#          one vectorized call against the worked examples of Chapter 7
+#          (Astronomical Algorithms, Jean Meeus)
+
+
+import numpy as np
+
+from lunar_phases_library import date_to_jde
+
+# (year, month, day) -> expected JDE, from Meeus Chapter 7
+dates = np.array([
+    [1957, 10, 4.81, 2436116.31],
+    [2000, 1, 1.5, 2451545.0],
+    [1999, 1, 1.0, 2451179.5],
+    [1987, 1, 27.0, 2446822.5],
+    [1987, 6, 19.5, 2446966.0],
+    [1988, 1, 27.0, 2447187.5],
+    [1988, 6, 19.5, 2447332.0],
+    [1900, 1, 1.0, 2415020.5],
+    [1600, 1, 1.0, 2305447.5],
+    [1600, 12, 31.0, 2305812.5],
+    [837, 4, 10.3, 2026871.8],
+    [-123, 12, 31.0, 1676496.5],
+    [-122, 1, 1.0, 1676497.5],
+    [-1000, 7, 12.5, 1356001.0],
+    [-1000, 2, 29.0, 1355866.5],
+    [-1001, 8, 17.9, 1355671.4],
+    [-4712, 1, 1.5, 0.0],
+])
+
+# loose enough that fastmath/fma reorderings in the implementation can
+# never flip a result, tight enough to catch any real calendar bug
+# (the smallest possible error is a whole day)
+TOL = 5e-3
+
+print("\n--------------   Lunar Phase Tests    --------------\n")
+jde = date_to_jde(dates[:, 0], dates[:, 1], dates[:, 2])
+expected = dates[:, 3]
+close = np.isclose(jde, expected, rtol=0, atol=TOL)
+for n in range(dates.shape[0]):
+    print("%5d-%02d-%05.2f -> %12.2f   %s" %
+          (dates[n, 0], dates[n, 1], dates[n, 2], jde[n],
+           "ok" if close[n] else "FAIL (expected %.2f)" % expected[n]))
+print("\nall passed" if np.allclose(jde, expected, rtol=0, atol=TOL)
+      else "\nFAILURES above")
+print("\n----------------------------------------------------\n")
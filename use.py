@@ -4,20 +4,52 @@
 # PURPOSE: Tests all our library functions
 
 
+import argparse
+
+import numpy as np
+
 from lunar_phases_library import *
 
-print("\n-------------- Lunar Phase Calculator --------------\n")
-y = float(input("Enter the year: "))
-m = float(input("Enter the month: "))
-d = float(input("Enter the day: "))
+parser = argparse.ArgumentParser(
+    description="Lunar Phase Calculator: one date via --year/--month/--day "
+                "(or interactive prompts), or a whole file of "
+                "'year month day' rows via --batch")
+parser.add_argument("--year", type=float, help="year of the date")
+parser.add_argument("--month", type=float, help="month of the date")
+parser.add_argument("--day", type=float,
+                    help="day of the date (fractional for time of day)")
+parser.add_argument("--batch", metavar="FILE",
+                    help="file of 'year month day' rows (see np.loadtxt)")
+args = parser.parse_args()
 
-print("\n--------------   Lunar Phase Output   --------------\n")
-out = get_illuminated_fraction_moon(y, m, d)
-print("\nPhase Information:")
-print("Illuminated Fraction: ", out["illuminated_fraction"])
-print("Position Angle: ", out["position_angle"])
-# print("\n")
-lunar_phase_ascii_art(out)
-print("\n----------------------------------------------------\n")
+if args.batch is not None:
+    # batch mode: every date converted in one vectorized pass through the
+    # parallel batch driver
+    dates = np.loadtxt(args.batch, ndmin=2)
+    y, m, d = dates[:, 0], dates[:, 1], dates[:, 2]
+    T = jde_to_T(date_to_jde(y, m, d))
+    k, x = illuminated_fraction_batch(T)
 
+    print("\n-------------- Lunar Phase Calculator --------------\n")
+    for n in range(dates.shape[0]):
+        print("%10.1f-%02d-%05.2f   Illuminated Fraction: %.6f   "
+              "Position Angle: %10.6f" %
+              (y[n], m[n], d[n], k[n], x[n]))
+    print("\n----------------------------------------------------\n")
+else:
+    print("\n-------------- Lunar Phase Calculator --------------\n")
+    y = args.year if args.year is not None else \
+        float(input("Enter the year: "))
+    m = args.month if args.month is not None else \
+        float(input("Enter the month: "))
+    d = args.day if args.day is not None else \
+        float(input("Enter the day: "))
 
+    print("\n--------------   Lunar Phase Output   --------------\n")
+    out = get_illuminated_fraction_moon(y, m, d)
+    print("\nPhase Information:")
+    print("Illuminated Fraction: ", out["illuminated_fraction"])
+    print("Position Angle: ", out["position_angle"])
+    # print("\n")
+    lunar_phase_ascii_art(out)
+    print("\n----------------------------------------------------\n")